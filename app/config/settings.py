@@ -12,4 +12,16 @@ DATE_FORMATS = [
     '%d.%m.%Y %H:%M:%S',
     '%d.%m.%Y',
     '%Y-%m-%d %H:%M:%S',
-]
\ No newline at end of file
+]
+
+# Кількість з'єднань у пулі для кожної бази SQLite
+DB_POOL_SIZE = 4
+
+# Скільки секунд чекати на вільне з'єднання з пулу, перш ніж повідомити про помилку
+DB_POOL_TIMEOUT = 30
+
+# Скільки рядків передається в один executemany при пакетному збереженні
+DB_BATCH_SIZE = 10_000
+
+# Читати .xlsx/.xlsm через python-calamine, якщо пакет встановлено (інакше openpyxl)
+EXCEL_USE_CALAMINE = True
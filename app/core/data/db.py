@@ -1,145 +1,429 @@
 import sqlite3
 import os
-from app.config.settings import DATA_DIR
+import queue
+import threading
+from itertools import islice
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import lru_cache
+from app.config.settings import DATA_DIR, DB_POOL_SIZE, DB_POOL_TIMEOUT, DB_BATCH_SIZE
+from app.core.utils.date_utils import period_to_int
+
+@dataclass(frozen=True)
+class BatchSpec:
+    table: str
+    columns: tuple
+    sql: str
+
+def _make_batch_spec(table, columns):
+    # SQL для вставки будується один раз для кожної таблиці
+    placeholders = ", ".join("?" * len(columns))
+    return BatchSpec(table, columns, f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders})")
+
+# Індекси під GROUP BY звітів і під пошук актів при коригуванні.
+# Порядок колонок збігається з GROUP BY, а amount і period_int включені,
+# щоб звіти читали лише індекс без звернень до таблиці
+_INDEXES = {
+    'acts': (
+        ('idx_acts_period', 'period_int'),
+        ('idx_acts_pcc', 'period, company, counterparty, period_int, amount'),
+        ('idx_acts_lookup', 'company, counterparty, period_int'),
+        ('idx_acts_year', 'company, period_int / 100, period_int, amount'),
+        ('idx_acts_counterparty', 'counterparty'),
+    ),
+    'payments': (
+        ('idx_payments_period', 'period_int'),
+        ('idx_payments_pcc', 'period, company, counterparty, period_int, amount'),
+        ('idx_payments_year', 'company, period_int / 100, period_int, amount'),
+    ),
+}
+
+# Налаштування, які діють лише в межах одного з'єднання, тому застосовуються до кожного в пулі
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA mmap_size=268435456",
+    "PRAGMA cache_size=-20000",
+    "PRAGMA foreign_keys=ON",
+)
+
+_RECORD_COLUMNS = ('company', 'counterparty', 'period', 'period_int', 'amount')
+_ACTS_BATCH = _make_batch_spec('acts', _RECORD_COLUMNS)
+_PAYMENTS_BATCH = _make_batch_spec('payments', _RECORD_COLUMNS)
+
+# Часті запити тримаємо константами, щоб кеш підготовлених виразів з'єднання спрацьовував по тому самому рядку
+_SELECT_ACTS_SQL = "SELECT company, counterparty, period, amount FROM acts"
+_SELECT_PAYMENTS_SQL = "SELECT company, counterparty, period, amount FROM payments"
+_ADJUST_ACTS_SQL = (
+    "UPDATE acts SET amount = amount + ? "
+    "WHERE company = ? AND counterparty = ? AND period_int = ?"
+)
+
+# Зведення будуємо як LEFT JOIN + UNION ALL рядків платежів без актів, а не FULL OUTER JOIN:
+# FULL JOIN по умовах з IS SQLite виконує вкладеним циклом без індексу (секунди на десятках тисяч груп),
+# а тут обидві частини шукають пару через автоматичний індекс
+_PERIOD_CTES = '''
+    WITH a AS (
+        SELECT period, company, counterparty, MAX(period_int) AS period_int, SUM(amount) AS act_amount
+        FROM acts
+        GROUP BY period, company, counterparty
+    ),
+    p AS (
+        SELECT period, company, counterparty, MAX(period_int) AS period_int, SUM(amount) AS payment_amount
+        FROM pay.payments
+        GROUP BY period, company, counterparty
+    )
+'''
+_SUMMARY_BY_PERIOD_SQL = _PERIOD_CTES + '''
+    SELECT period, company, counterparty, act_amount, payment_amount
+    FROM (
+        SELECT a.period, a.company, a.counterparty, a.period_int,
+               a.act_amount, COALESCE(p.payment_amount, 0) AS payment_amount
+        FROM a LEFT JOIN p
+            ON a.period IS p.period AND a.company IS p.company AND a.counterparty IS p.counterparty
+        UNION ALL
+        SELECT p.period, p.company, p.counterparty, p.period_int, 0, p.payment_amount
+        FROM p
+        WHERE NOT EXISTS (
+            SELECT 1 FROM a
+            WHERE a.period IS p.period AND a.company IS p.company AND a.counterparty IS p.counterparty
+        )
+    )
+    ORDER BY period_int, company, counterparty
+'''
+
+_COMPANY_CTES = '''
+    WITH a AS (
+        SELECT company, period_int / 100 AS year, SUM(amount) AS act_amount
+        FROM acts
+        WHERE period_int IS NOT NULL
+        GROUP BY company, year
+    ),
+    p AS (
+        SELECT company, period_int / 100 AS year, SUM(amount) AS payment_amount
+        FROM pay.payments
+        WHERE period_int IS NOT NULL
+        GROUP BY company, year
+    )
+'''
+_SUMMARY_BY_COMPANY_SQL = _COMPANY_CTES + '''
+    SELECT a.company, CAST(a.year AS TEXT), a.act_amount, COALESCE(p.payment_amount, 0)
+    FROM a LEFT JOIN p ON a.company IS p.company AND a.year = p.year
+    UNION ALL
+    SELECT p.company, CAST(p.year AS TEXT), 0, p.payment_amount
+    FROM p
+    WHERE NOT EXISTS (SELECT 1 FROM a WHERE a.company IS p.company AND a.year = p.year)
+    ORDER BY 2, 1
+'''
+
+def _loose_scan_sql(table, column):
+    # Емуляція loose index scan: кожен крок перестрибує на наступне значення в індексі,
+    # тому дублікати не читаються взагалі
+    return f'''
+        WITH RECURSIVE t(v) AS (
+            SELECT (SELECT {column} FROM {table} WHERE {column} IS NOT NULL ORDER BY {column} LIMIT 1)
+            UNION ALL
+            SELECT (SELECT {column} FROM {table} WHERE {column} > t.v ORDER BY {column} LIMIT 1)
+            FROM t WHERE t.v IS NOT NULL
+        )
+        SELECT v FROM t WHERE v IS NOT NULL
+    '''
+
+_UNIQUE_COMPANIES_SQL = _loose_scan_sql('acts', 'company')
+_UNIQUE_COUNTERPARTIES_SQL = _loose_scan_sql('acts', 'counterparty')
+
+# Розмір кешу підготовлених виразів на одне з'єднання
+_STATEMENT_CACHE_SIZE = 256
+# Скільки рядків за раз забираємо з курсора при потоковому читанні
+_FETCH_SIZE = 1000
+
+# Заміни для компаній
+_COMPANY_REPLACEMENTS = {
+    "САН ПАУЕР ПЕРВОМАЙСЬК ТОВ": "ПЕРВОМАЙСЬК",
+    'ТОВ "ФРІ-ЕНЕРДЖИ ГЕНІЧЕСЬК"': "ФРІ-ЕНЕРДЖИ",
+    'ТОВ "ПОРТ-СОЛАР"': "ПОРТ-СОЛАР",
+    'ТОВ "СКІФІЯ-СОЛАР-2"': "СКІФІЯ-СОЛАР-2",
+    'ТОВ "СКІФІЯ-СОЛАР-1"': "СКІФІЯ-СОЛАР-1",
+    "ДИМЕРСЬКА СЕС-1 ТОВ": "ДИМЕРСЬКА СЕС-1",
+    'ТОВ "ТЕРСЛАВ"': "ТЕРСЛАВ"
+}
+
+# Набір компаній і контрагентів невеликий, тому результати нормалізації кешуємо
+@lru_cache(maxsize=4096)
+def _normalize_company(company):
+    # Переводимо в верхній регістр
+    company = company.upper()
+    return _COMPANY_REPLACEMENTS.get(company, company)
+
+@lru_cache(maxsize=4096)
+def _normalize_counterparty(counterparty):
+    # Переводимо в верхній регістр
+    counterparty = counterparty.upper()
+    # Заміна для контрагента
+    if "ГАРАНТОВАНИЙ ПОКУПЕЦЬ ДП" in counterparty:
+        return "ГАРАНТОВАНИЙ ПОКУПЕЦЬ"
+    return counterparty
 
 class DatabaseManager:
     def __init__(self):
         os.makedirs(DATA_DIR, exist_ok=True)
-        
-        self.conn_acts = sqlite3.connect(os.path.join(DATA_DIR, "acts.db"))
-        self.cursor_acts = self.conn_acts.cursor()
-        self.conn_payments = sqlite3.connect(os.path.join(DATA_DIR, "payments.db"))
-        self.cursor_payments = self.conn_payments.cursor()
+
+        self.acts_db = os.path.join(DATA_DIR, "acts.db")
+        self.payments_db = os.path.join(DATA_DIR, "payments.db")
+
+        # До з'єднань з acts.db підключаємо payments.db, щоб звіти рахувались одним запитом
+        attach = {self.acts_db: {'pay': self.payments_db}, self.payments_db: None}
+
+        # Пул з'єднань для читання, щоб потоки не чекали одне на одного
+        self._pools = {path: self._create_pool(path, attach[path]) for path in attach}
+        # SQLite допускає лише одного записувача, тому для запису тримаємо окреме з'єднання під замком
+        self._writers = {path: (self._open_connection(path, attach[path]), threading.Lock()) for path in attach}
+        # Лічильник записів: кешовані довідники дійсні, доки він не змінився
+        self._generation = 0
+        self._unique_cache = {}
+        self._closed = False
+
         self.init_db()
 
+    def _open_connection(self, db_path, attach=None):
+        conn = sqlite3.connect(db_path, check_same_thread=False, cached_statements=_STATEMENT_CACHE_SIZE)
+        # Рядки повертаються звичайними кортежами: усі виклики розпаковують їх за позицією
+        conn.row_factory = None
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        for alias, attached_path in (attach or {}).items():
+            conn.execute(f"ATTACH DATABASE ? AS {alias}", (attached_path,))
+            # Режим журналу та синхронізація задаються для кожної схеми окремо
+            conn.execute(f"PRAGMA {alias}.journal_mode=WAL")
+            conn.execute(f"PRAGMA {alias}.synchronous=NORMAL")
+        return conn
+
+    def _create_pool(self, db_path, attach=None):
+        pool = queue.Queue(maxsize=DB_POOL_SIZE)
+        for _ in range(DB_POOL_SIZE):
+            pool.put(self._open_connection(db_path, attach))
+        return pool
+
+    @contextmanager
+    def _get_connection(self, db_path):
+        if self._closed:
+            raise sqlite3.ProgrammingError("База даних уже закрита")
+        pool = self._pools[db_path]
+        try:
+            # Без тайм-ауту читання після close() або з вичерпаним пулом зависло б назавжди
+            conn = pool.get(timeout=DB_POOL_TIMEOUT)
+        except queue.Empty:
+            raise sqlite3.OperationalError(
+                f"Немає вільного з'єднання з базою {db_path} протягом {DB_POOL_TIMEOUT} с"
+            ) from None
+        try:
+            yield conn
+        finally:
+            # З'єднання, взяте до close(), закриваємо, а не повертаємо в пул
+            if self._closed:
+                conn.close()
+            else:
+                pool.put(conn)
+
+    @contextmanager
+    def _get_write_connection(self, db_path):
+        conn, lock = self._writers[db_path]
+        with lock:
+            try:
+                yield conn
+            finally:
+                self._generation += 1
+
     def init_db(self):
-        self.cursor_acts.execute('''
-            CREATE TABLE IF NOT EXISTS acts (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                company TEXT,
-                counterparty TEXT,
-                period TEXT,
-                amount REAL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        self.cursor_payments.execute('''
-            CREATE TABLE IF NOT EXISTS payments (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                company TEXT,
-                counterparty TEXT,
-                period TEXT,
-                amount REAL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        ''')
-
-        self.cursor_payments.execute('''
-            CREATE UNIQUE INDEX IF NOT EXISTS unique_payment 
-            ON payments (company, counterparty, period, amount)
-        ''')
-
-        self.conn_acts.commit()
-        self.conn_payments.commit()
+        with self._get_write_connection(self.acts_db) as conn:
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS acts (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    company TEXT,
+                    counterparty TEXT,
+                    period TEXT,
+                    period_int INTEGER,
+                    amount REAL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+            ''')
+            # Міграція старих баз: період зберігається також як ціле yyyymm
+            conn.executescript(self._migration_script(conn, 'acts'))
+
+        with self._get_write_connection(self.payments_db) as conn:
+            conn.executescript('''
+                CREATE TABLE IF NOT EXISTS payments (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    company TEXT,
+                    counterparty TEXT,
+                    period TEXT,
+                    period_int INTEGER,
+                    amount REAL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                );
+                CREATE UNIQUE INDEX IF NOT EXISTS unique_payment
+                ON payments (company, counterparty, period, amount);
+            ''')
+            conn.executescript(self._migration_script(conn, 'payments'))
+
+    def _migration_script(self, conn, table):
+        has_period_int = conn.execute(
+            "SELECT 1 FROM pragma_table_info(?) WHERE name = 'period_int' LIMIT 1", (table,)
+        ).fetchone() is not None
+        stmts = []
+        if not has_period_int:
+            stmts.append(f"ALTER TABLE {table} ADD COLUMN period_int INTEGER")
+            # Ті самі правила, що й у period_to_int: "mm-yyyy" або "mm.yyyy" з місяцем 01-12
+            stmts.append(f'''
+                UPDATE {table}
+                SET period_int = CAST(substr(period, 4, 4) AS INTEGER) * 100 + CAST(substr(period, 1, 2) AS INTEGER)
+                WHERE period GLOB '[0-9][0-9]?[0-9][0-9][0-9][0-9]'
+                  AND substr(period, 3, 1) IN ('-', '.')
+                  AND CAST(substr(period, 1, 2) AS INTEGER) BETWEEN 1 AND 12
+            ''')
+
+        existing = {row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ?", (table,)
+        )}
+        missing = [(name, columns) for name, columns in _INDEXES[table] if name not in existing]
+        for name, columns in missing:
+            stmts.append(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({columns})")
+        if missing:
+            # Оновлюємо статистику для планувальника лише після створення нових індексів
+            stmts.append(f"ANALYZE {table}")
+
+        if not stmts:
+            return ""
+        return "BEGIN;\n" + ";\n".join(stmts) + ";\nCOMMIT;"
 
     def normalize_company(self, company):
-        # Переводимо в верхній регістр
-        company = company.upper()
-        # Заміни для компаній
-        replacements = {
-            "САН ПАУЕР ПЕРВОМАЙСЬК ТОВ": "ПЕРВОМАЙСЬК",
-            'ТОВ "ФРІ-ЕНЕРДЖИ ГЕНІЧЕСЬК"': "ФРІ-ЕНЕРДЖИ",
-            'ТОВ "ПОРТ-СОЛАР"': "ПОРТ-СОЛАР",
-            'ТОВ "СКІФІЯ-СОЛАР-2"': "СКІФІЯ-СОЛАР-2",
-            'ТОВ "СКІФІЯ-СОЛАР-1"': "СКІФІЯ-СОЛАР-1",
-            "ДИМЕРСЬКА СЕС-1 ТОВ": "ДИМЕРСЬКА СЕС-1",
-            'ТОВ "ТЕРСЛАВ"': "ТЕРСЛАВ"
-        }
-        return replacements.get(company, company)
+        return _normalize_company(company)
 
     def normalize_counterparty(self, counterparty):
-        # Переводимо в верхній регістр
-        counterparty = counterparty.upper()
-        # Заміна для контрагента
-        if "ГАРАНТОВАНИЙ ПОКУПЕЦЬ ДП" in counterparty:
-            return "ГАРАНТОВАНИЙ ПОКУПЕЦЬ"
-        return counterparty
+        return _normalize_counterparty(counterparty)
 
-    def save_act(self, company, counterparty, period, amount):
+    def _build_record(self, company, counterparty, period, amount):
         # Нормалізуємо company і counterparty перед збереженням
         company = self.normalize_company(company)
         counterparty = self.normalize_counterparty(counterparty)
-        
-        self.cursor_acts.execute('''
-            INSERT INTO acts (company, counterparty, period, amount)
-            VALUES (?, ?, ?, ?)
-        ''', (company, counterparty, period, amount))
-        self.conn_acts.commit()
+        return (company, counterparty, period, period_to_int(period), amount)
+
+    def _save_generic(self, db_path, spec, company, counterparty, period, amount):
+        record = self._build_record(company, counterparty, period, amount)
+        with self._get_write_connection(db_path) as conn, conn:
+            conn.execute(spec.sql, record)
+
+    def _save_batch(self, db_path, spec, rows):
+        # Рядки вставляються частинами по DB_BATCH_SIZE, але в одній транзакції,
+        # тож у пам'яті одночасно лише одна частина, а імпорт або проходить повністю, або ні
+        records = (self._build_record(*row) for row in rows)
+        saved = 0
+        with self._get_write_connection(db_path) as conn, conn:
+            while chunk := list(islice(records, DB_BATCH_SIZE)):
+                saved += conn.executemany(spec.sql, chunk).rowcount
+        return saved
+
+    def save_act(self, company, counterparty, period, amount):
+        self._save_generic(self.acts_db, _ACTS_BATCH, company, counterparty, period, amount)
 
     def save_payment(self, company, counterparty, period, amount):
-        # Нормалізуємо company і counterparty перед збереженням
-        company = self.normalize_company(company)
-        counterparty = self.normalize_counterparty(counterparty)
-        
-        self.cursor_payments.execute('''
-            INSERT INTO payments (company, counterparty, period, amount)
-            VALUES (?, ?, ?, ?)
-        ''', (company, counterparty, period, amount))
-        self.conn_payments.commit()
+        self._save_generic(self.payments_db, _PAYMENTS_BATCH, company, counterparty, period, amount)
+
+    def save_acts_batch(self, rows):
+        return self._save_batch(self.acts_db, _ACTS_BATCH, rows)
+
+    def save_payments_batch(self, rows):
+        return self._save_batch(self.payments_db, _PAYMENTS_BATCH, rows)
 
     def adjust_acts(self, company, counterparty, period, adjustment_amount):
         # Нормалізуємо company і counterparty перед коригуванням
         company = self.normalize_company(company)
         counterparty = self.normalize_counterparty(counterparty)
-        
-        # Отримуємо всі акти за вказаним періодом, компанією та контрагентом
-        self.cursor_acts.execute('''
-            SELECT id, amount 
-            FROM acts 
-            WHERE company = ? AND counterparty = ? AND period = ?
-        ''', (company, counterparty, period))
-        acts = self.cursor_acts.fetchall()
-
-        if not acts:
-            # Якщо актів за періодом немає, додаємо новий запис із сумою коригування
-            self.cursor_acts.execute('''
-                INSERT INTO acts (company, counterparty, period, amount)
-                VALUES (?, ?, ?, ?)
-            ''', (company, counterparty, period, adjustment_amount))
-        else:
-            # Оновлюємо суму для всіх актів за періодом
-            for act in acts:
-                act_id, amount = act
-                new_amount = amount + adjustment_amount
-                self.cursor_acts.execute('''
-                    UPDATE acts 
-                    SET amount = ? 
-                    WHERE id = ?
-                ''', (new_amount, act_id))
-
-        self.conn_acts.commit()
+        period_int = period_to_int(period)
+        if period_int is None:
+            raise ValueError(f"Некоректний формат періоду: {period}")
+
+        with self._get_write_connection(self.acts_db) as conn, conn:
+            # Коригуємо всі акти за періодом, компанією та контрагентом одним запитом
+            cursor = conn.execute(_ADJUST_ACTS_SQL, (adjustment_amount, company, counterparty, period_int))
+
+            if cursor.rowcount == 0:
+                # Якщо актів за періодом немає, додаємо новий запис із сумою коригування
+                conn.execute(_ACTS_BATCH.sql, (company, counterparty, period, period_int, adjustment_amount))
+
+    def _iter_rows(self, db_path, sql):
+        # З'єднання повертається в пул у finally з _get_connection: коли генератор вичерпано,
+        # закрито або зібрано збирачем сміття. Незакритий генератор тримає з'єднання весь цей час
+        with self._get_connection(db_path) as conn:
+            cursor = conn.execute(sql)
+            try:
+                cursor.arraysize = _FETCH_SIZE
+                while rows := cursor.fetchmany():
+                    yield from rows
+            finally:
+                cursor.close()
+
+    def iter_all_acts(self):
+        return self._iter_rows(self.acts_db, _SELECT_ACTS_SQL)
+
+    def iter_all_payments(self):
+        return self._iter_rows(self.payments_db, _SELECT_PAYMENTS_SQL)
 
     def get_all_acts(self):
-        self.cursor_acts.execute('''
-            SELECT company, counterparty, period, amount 
-            FROM acts
-        ''')
-        return self.cursor_acts.fetchall()
+        return list(self.iter_all_acts())
 
     def get_all_payments(self):
-        self.cursor_payments.execute('''
-            SELECT company, counterparty, period, amount 
-            FROM payments
-        ''')
-        return self.cursor_payments.fetchall()
+        return list(self.iter_all_payments())
+
+    def _get_unique(self, sql):
+        # Списки для форм змінюються лише після запису, тому між записами беремо їх з кешу.
+        # Покоління запам'ятовуємо до запиту: якщо запис стався під час читання, кеш просто застаріє
+        generation = self._generation
+        cached = self._unique_cache.get(sql)
+        if cached is not None and cached[0] == generation:
+            return list(cached[1])
+        with self._get_connection(self.acts_db) as conn:
+            values = [row[0] for row in conn.execute(sql)]
+        self._unique_cache[sql] = (generation, values)
+        return list(values)
+
+    def get_unique_companies(self):
+        return self._get_unique(_UNIQUE_COMPANIES_SQL)
+
+    def get_unique_counterparties(self):
+        return self._get_unique(_UNIQUE_COUNTERPARTIES_SQL)
+
+    def get_summary_by_period(self):
+        # Сортування за періодом виконує SQLite
+        with self._get_connection(self.acts_db) as conn:
+            return conn.execute(_SUMMARY_BY_PERIOD_SQL).fetchall()
+
+    def get_summary_by_company(self):
+        with self._get_connection(self.acts_db) as conn:
+            return conn.execute(_SUMMARY_BY_COMPANY_SQL).fetchall()
 
     def clear_database(self):
-        self.cursor_acts.execute('DELETE FROM acts')
-        self.cursor_payments.execute('DELETE FROM payments')
-        self.conn_acts.commit()
-        self.conn_payments.commit()
-
-    def __del__(self):
-        self.conn_acts.close()
-        self.conn_payments.close()
\ No newline at end of file
+        # Обидві таблиці очищаються одним COMMIT через підключену базу оплат, а замок записувача
+        # payments.db тримаємо, щоб ніхто не писав туди паралельно. У режимі WAL SQLite фіксує таку
+        # транзакцію атомарно лише в межах кожного файлу: після збою під час COMMIT можлива
+        # ситуація, коли очищена лише одна з таблиць
+        with self._get_write_connection(self.payments_db), \
+                self._get_write_connection(self.acts_db) as conn, conn:
+            conn.execute('DELETE FROM acts')
+            conn.execute('DELETE FROM pay.payments')
+
+    def close(self):
+        # Явно закриваємо всі з'єднання замість очікування збирача сміття
+        self._closed = True
+        for pool in self._pools.values():
+            while not pool.empty():
+                pool.get_nowait().close()
+        for conn, _ in self._writers.values():
+            conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
\ No newline at end of file
@@ -1,7 +1,52 @@
+import importlib.util
+import os
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 import pandas as pd
 import logging
-from app.core.utils.date_utils import extract_month, extract_month_from_date
-from app.config.settings import SUPPORTED_EXTENSIONS
+from app.core.utils.date_utils import extract_month_series, extract_month_from_date_series
+from app.config.settings import SUPPORTED_EXTENSIONS, EXCEL_USE_CALAMINE
+
+def _to_numeric(series):
+    # Якщо Excel уже віддав числа, повторне перетворення не потрібне
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+    return pd.to_numeric(series, errors='coerce')
+
+def _parse_amounts(series):
+    # Суми з банківської виписки можуть бути текстом з пробілами та комою як роздільником
+    if pd.api.types.is_numeric_dtype(series):
+        return series
+    cleaned = (series.astype('string')
+               .str.replace('\xa0', '', regex=False)
+               .str.replace(' ', '', regex=False)
+               .str.replace(',', '.', regex=False))
+    return pd.to_numeric(cleaned, errors='coerce')
+
+# python-calamine значно швидший за openpyxl, але це необов'язкова залежність
+_XLSX_ENGINE = 'calamine' if EXCEL_USE_CALAMINE and importlib.util.find_spec('python_calamine') else 'openpyxl'
+
+# Рушій читання для кожного підтримуваного розширення
+_EXCEL_ENGINES = {'.xlsx': _XLSX_ENGINE, '.xlsm': _XLSX_ENGINE, '.xls': 'xlrd'}
+
+def _map_unique(series, transform):
+    # Різних назв у колонці небагато, тому перетворюємо лише унікальні значення
+    # і розкладаємо результат назад за кодами factorize (пропуски мають код -1)
+    codes, uniques = pd.factorize(series.astype('string'))
+    values = transform(pd.Series(uniques, dtype='string')).array
+    return pd.Series(values.take(codes, allow_fill=True), index=series.index)
+
+# Колонки підготовленого DataFrame у порядку вставки в базу
+_ROW_COLUMNS = ('company', 'counterparty', 'period', 'amount')
+
+def _frame_rows(df):
+    # Рядки для вставки збираємо з масивів колонок, без побудови Series на кожен рядок.
+    # dtype=object дає звичайні str/float, які sqlite3 прив'язує без адаптерів;
+    # рядки з пропусками сюди не доходять, їх відсіює _check_rows
+    return zip(*(df[col].to_numpy(dtype=object) for col in _ROW_COLUMNS))
+
+# Назви компаній і контрагентів завжди читаємо як текст
+_NAME_DTYPES = {'Контрагент': 'string', 'Организация': 'string'}
 
 class DataProcessor:
     def __init__(self):
@@ -24,110 +69,147 @@ class DataProcessor:
             "ГАРАНТОВАНИЙ ПОКУПЕЦЬ ДП": "ГАРАНТОВАНИЙ ПОКУПЕЦЬ"
         }
 
-    def to_upper(self, value):
-        """Переводить рядок у верхній регістр."""
-        return value.upper() if isinstance(value, str) else value
+    def _pick_engine(self, file_path):
+        engine = _EXCEL_ENGINES.get(os.path.splitext(file_path)[1].lower())
+        if engine is None:
+            self.logger.error("Unsupported file format: %s. Supported formats: %s", file_path, ', '.join(SUPPORTED_EXTENSIONS))
+            raise ValueError(f"Непідтримуваний формат файлу: {file_path}. Підтримуються лише {', '.join(SUPPORTED_EXTENSIONS)}")
+        return engine
+
+    def normalize_company_series(self, series):
+        # Верхній регістр і заміни з company_replacements для цілої колонки
+        return _map_unique(series, self._normalize_company_values)
+
+    def normalize_counterparty_series(self, series):
+        # Верхній регістр і заміни з counterparty_replacements для цілої колонки
+        return _map_unique(series, self._normalize_counterparty_values)
 
-    def normalize_company(self, company):
-        company = self.to_upper(company)
-        normalized = self.company_replacements.get(company, company)
-        if normalized != company:
-            self.logger.debug(f"Normalized company: {company} -> {normalized}")
-        return normalized
+    def _normalize_company_values(self, companies):
+        companies = companies.str.upper()
+        return companies.map(self.company_replacements).fillna(companies)
 
-    def normalize_counterparty(self, counterparty):
-        counterparty = self.to_upper(counterparty)
+    def _normalize_counterparty_values(self, counterparties):
+        counterparties = counterparties.str.upper()
         for original, replacement in self.counterparty_replacements.items():
-            if original in counterparty:
-                self.logger.debug(f"Normalized counterparty: {counterparty} -> {replacement}")
-                return replacement
-        return counterparty
-
-    def load_excel(self, file_path):
-        if not file_path.endswith(SUPPORTED_EXTENSIONS):
-            self.logger.error(f"Unsupported file format: {file_path}. Supported formats: {', '.join(SUPPORTED_EXTENSIONS)}")
-            raise ValueError(f"Непідтримуваний формат файлу: {file_path}. Підтримуються лише {', '.join(SUPPORTED_EXTENSIONS)}")
+            counterparties = counterparties.mask(counterparties.str.contains(original, regex=False, na=False), replacement)
+        return counterparties
+
+    @contextmanager
+    def _open_excel(self, file_path):
+        # Книга відкривається один раз: і заголовок, і дані читаються з того самого ExcelFile
+        engine = self._pick_engine(file_path)
 
         try:
-            if file_path.endswith('.xlsx') or file_path.endswith('.xlsm'):
-                self.logger.debug(f"Loading {file_path} with openpyxl engine")
-                return pd.read_excel(file_path, engine='openpyxl')
-            elif file_path.endswith('.xls'):
-                self.logger.debug(f"Loading {file_path} with xlrd engine")
-                return pd.read_excel(file_path, engine='xlrd')
+            self.logger.debug("Loading %s with %s engine", file_path, engine)
+            with pd.ExcelFile(file_path, engine=engine) as excel_file:
+                yield excel_file
         except FileNotFoundError as e:
-            self.logger.error(f"File not found: {file_path}")
+            self.logger.error("File not found: %s", file_path)
             raise ValueError(f"Файл не знайдено: {file_path}") from e
+        except ValueError:
+            raise
         except Exception as e:
-            self.logger.error(f"Failed to load file {file_path}: {str(e)}")
+            self.logger.error("Failed to load file %s: %s", file_path, e)
             raise ValueError(f"Не вдалося завантажити файл {file_path}: {str(e)}") from e
 
-    def process_1c_acts(self, file_path, db_manager):
-        df = self.load_excel(file_path)
-        required_columns = ['Дата', 'Сумма', 'Контрагент', 'Организация']
-        
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            self.logger.error(f"Missing required columns: {missing_columns}")
-            raise ValueError(f"Не знайдено колонки: {', '.join(missing_columns)}")
+    def load_excel(self, file_path, usecols=None, dtype=None, nrows=None):
+        with self._open_excel(file_path) as excel_file:
+            return excel_file.parse(usecols=usecols, dtype=dtype, nrows=nrows)
+
+    def _load_required(self, file_path, required_columns):
+        with self._open_excel(file_path) as excel_file:
+            # Спершу перевіряємо заголовок (nrows=0), щоб не розбирати весь файл, якщо колонок бракує
+            columns = excel_file.parse(nrows=0).columns
+            missing_columns = [col for col in required_columns if col not in columns]
+            if missing_columns:
+                self.logger.error("Missing required columns: %s", missing_columns)
+                raise ValueError(f"Не знайдено колонки: {', '.join(missing_columns)}")
+
+            # Читаємо лише потрібні колонки
+            return excel_file.parse(usecols=required_columns, dtype=_NAME_DTYPES)
+
+    def _check_rows(self, df, error_message):
+        # Рядок некоректний, якщо немає періоду, суми або назви: порожня назва не може потрапити в базу
+        bad_period = df['period'].isna().to_numpy()
+        bad_amount = df['amount'].isna().to_numpy()
+        bad_name = df['company'].isna().to_numpy() | df['counterparty'].isna().to_numpy()
+        invalid = bad_period | bad_amount | bad_name
+        if invalid.any():
+            # У лог потрапляють лише перші індекси некоректних рядків, без копії самих рядків
+            self.logger.error("Invalid rows detected (%d bad periods, %d bad amounts, %d blank names), first rows: %s",
+                              bad_period.sum(), bad_amount.sum(), bad_name.sum(), df.index[invalid][:10].tolist())
+            raise ValueError(error_message)
+
+    def _prepare_1c_acts(self, file_path):
+        df = self._load_required(file_path, ['Дата', 'Сумма', 'Контрагент', 'Организация'])
 
         # Векторизована обробка
-        df['period'] = df['Дата'].apply(extract_month_from_date)
-        df['amount'] = pd.to_numeric(df['Сумма'], errors='coerce')
-        df['counterparty'] = df['Контрагент'].apply(self.normalize_counterparty)
-        df['company'] = df['Организация'].apply(self.normalize_company)
+        df['period'] = extract_month_from_date_series(df['Дата'])
+        df['amount'] = _to_numeric(df['Сумма'])
+        df['counterparty'] = self.normalize_counterparty_series(df['Контрагент'])
+        df['company'] = self.normalize_company_series(df['Организация'])
 
         # Перевіряємо на помилки
-        invalid_rows = df[df['period'].isna() | df['amount'].isna()]
-        if not invalid_rows.empty:
-            self.logger.error(f"Invalid rows detected: {invalid_rows}")
-            raise ValueError("Деякі рядки мають некоректні значення для дати або суми")
+        self._check_rows(df, "Деякі рядки мають некоректні значення для дати, суми, контрагента або організації")
 
-        processed_count = 0
-        for _, row in df.iterrows():
-            db_manager.save_act(row['company'], row['counterparty'], row['period'], row['amount'])
-            processed_count += 1
+        return df[list(_ROW_COLUMNS)]
 
-        self.logger.info(f"Processed {processed_count} acts from {file_path}")
+    def process_1c_acts(self, file_path, db_manager):
+        df = self._prepare_1c_acts(file_path)
+        processed_count = db_manager.save_acts_batch(_frame_rows(df))
 
-    def process_1c_payments(self, file_path, db_manager):
-        df = self.load_excel(file_path)
-        required_columns = ['Комментарий', 'Сумма документа', 'Контрагент', 'Организация']
-        
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        if missing_columns:
-            self.logger.error(f"Missing required columns: {missing_columns}")
-            raise ValueError(f"Не знайдено колонки: {', '.join(missing_columns)}")
+        self.logger.info("Processed %d acts from %s", processed_count, file_path)
+
+    def _prepare_1c_payments(self, file_path):
+        df = self._load_required(file_path, ['Комментарий', 'Сумма документа', 'Контрагент', 'Организация'])
 
         # Векторизована обробка
-        df['period'] = df['Комментарий'].apply(extract_month)
-        df['amount'] = pd.to_numeric(df['Сумма документа'], errors='coerce')
-        df['counterparty'] = df['Контрагент'].apply(self.normalize_counterparty)
-        df['company'] = df['Организация'].apply(self.normalize_company)
+        df['period'] = extract_month_series(df['Комментарий'])
+        df['amount'] = _to_numeric(df['Сумма документа'])
+        df['counterparty'] = self.normalize_counterparty_series(df['Контрагент'])
+        df['company'] = self.normalize_company_series(df['Организация'])
 
         # Перевіряємо на помилки
-        invalid_rows = df[df['period'].isna() | df['amount'].isna()]
-        if not invalid_rows.empty:
-            self.logger.error(f"Invalid rows detected: {invalid_rows}")
-            raise ValueError("Деякі рядки мають некоректні значення для періоду або суми")
+        self._check_rows(df, "Деякі рядки мають некоректні значення для періоду, суми, контрагента або організації")
 
-        processed_count = 0
-        for _, row in df.iterrows():
-            db_manager.save_payment(row['company'], row['counterparty'], row['period'], row['amount'])
-            processed_count += 1
+        return df[list(_ROW_COLUMNS)]
 
-        self.logger.info(f"Processed {processed_count} payments from {file_path}")
+    def process_1c_payments(self, file_path, db_manager):
+        df = self._prepare_1c_payments(file_path)
+        processed_count = db_manager.save_payments_batch(_frame_rows(df))
+
+        self.logger.info("Processed %d payments from %s", processed_count, file_path)
+
+    def process_excel_files(self, files, db_manager):
+        # files: список пар (шлях, 'acts' | 'payments').
+        # Файли розбираються паралельно в окремих процесах, а запис у базу лишається в цьому процесі.
+        # Якщо хоч один файл не пройшов розбір чи перевірку, нічого не зберігається. Але кожен файл
+        # записується власною транзакцією, тож помилка під час запису (наприклад, дубль оплати
+        # в unique_payment) не скасовує файли, збережені перед ним
+        if not files:
+            return 0
+        if len(files) == 1:
+            frames = [_prepare_file(*files[0])]
+        else:
+            with ProcessPoolExecutor(max_workers=min(len(files), os.cpu_count() or 1)) as executor:
+                frames = list(executor.map(_prepare_file, *zip(*files)))
+
+        processed_count = 0
+        for (file_path, kind), df in zip(files, frames):
+            processed_count += _FILE_KINDS[kind][1](db_manager, _frame_rows(df))
+            self.logger.info("Processed %d rows (%s) from %s", len(df), kind, file_path)
+        return processed_count
 
     def process_bank_payments(self, df):
         required_columns = ['NAME', 'NAME_KOR', 'PURPOSE', 'SUM_PD_NOM']
         
         missing_columns = [col for col in required_columns if col not in df.columns]
         if missing_columns:
-            self.logger.error(f"Missing required columns: {missing_columns}")
+            self.logger.error("Missing required columns: %s", missing_columns)
             raise ValueError(f"Не знайдено колонки: {', '.join(missing_columns)}")
 
         # Векторизована обробка
-        df['місяць'] = df['PURPOSE'].apply(extract_month)
+        df['місяць'] = extract_month_series(df['PURPOSE'])
         df = df.dropna(subset=['місяць'])
         
         if df.empty:
@@ -135,13 +217,32 @@ class DataProcessor:
             return pd.DataFrame()
 
         # Нормалізуємо компанії та контрагентів
-        df['NAME'] = df['NAME'].map(self.normalize_company)
-        df['NAME_KOR'] = df['NAME_KOR'].map(self.normalize_counterparty)
+        # Після нормалізації різних назв небагато, тому групуємо за категоріями
+        df['NAME'] = self.normalize_company_series(df['NAME']).astype('category')
+        df['NAME_KOR'] = self.normalize_counterparty_series(df['NAME_KOR']).astype('category')
+        df['SUM_PD_NOM'] = _parse_amounts(df['SUM_PD_NOM'])
+        # Групуємо за цілим yyyymm замість рядка "mm-yyyy": швидше і впорядковано за часом
+        month = df['місяць']
+        df['місяць'] = month.str.slice(3).astype('int32') * 100 + month.str.slice(0, 2).astype('int32')
         
-        monthly_summary = df.groupby(['NAME', 'NAME_KOR', 'місяць']).agg({
-            'SUM_PD_NOM': 'sum',
-            'NAME_KOR': 'count'
-        }).rename(columns={'NAME_KOR': 'кількість платежів'})
+        # observed=True: лише наявні комбінації, без декартового добутку категорій;
+        # groupby уже повертає групи відсортованими, окремий sort_index не потрібен
+        monthly_summary = df.groupby(['NAME', 'NAME_KOR', 'місяць'], observed=True).agg(**{
+            'SUM_PD_NOM': ('SUM_PD_NOM', 'sum'),
+            'кількість платежів': ('NAME_KOR', 'size'),
+        })
+        # Повертаємо місяць у звичному вигляді "mm-yyyy"
+        monthly_summary = monthly_summary.rename(index=lambda value: f"{value % 100:02d}-{value // 100}", level='місяць')
         
-        self.logger.info(f"Processed {len(monthly_summary)} bank payment summaries")
-        return monthly_summary.sort_index()
\ No newline at end of file
+        self.logger.info("Processed %d bank payment summaries", len(monthly_summary))
+        return monthly_summary
+
+# Тип файлу -> (метод підготовки DataProcessor, метод пакетного збереження DatabaseManager)
+_FILE_KINDS = {
+    'acts': (DataProcessor._prepare_1c_acts, lambda db_manager, rows: db_manager.save_acts_batch(rows)),
+    'payments': (DataProcessor._prepare_1c_payments, lambda db_manager, rows: db_manager.save_payments_batch(rows)),
+}
+
+def _prepare_file(file_path, kind):
+    # Виконується в окремому процесі: лише читання і підготовка, база сюди не передається
+    return _FILE_KINDS[kind][0](DataProcessor(), file_path)
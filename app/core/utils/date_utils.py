@@ -1,19 +1,33 @@
 import re
 import pandas as pd
 from datetime import datetime
+from functools import lru_cache
 from app.config.settings import DATE_FORMATS
 
+# Формат "mm.yyyy" або "mm-yyyy" у тексті призначення платежу
+_MONTH_RE = re.compile(r'(\d{2})[.-](\d{4})')
+
 def extract_month(text):
     if pd.isna(text):
         return None
     text = str(text).lower()
     # Шукаємо формат "mm.yyyy" або "mm-yyyy"
-    match = re.search(r'(\d{2})[.-](\d{4})', text)
+    match = _MONTH_RE.search(text)
     if match:
-        month, year = match.groups()
-        return f"{month}-{year}"
+        return f"{match[1]}-{match[2]}"
     return None
 
+# Періоди в межах одного імпорту сильно повторюються
+@lru_cache(maxsize=4096)
+def period_to_int(period):
+    # Пакуємо період "mm-yyyy" (або "mm.yyyy") у ціле число yyyymm
+    if not isinstance(period, str) or len(period) != 7 or period[2] not in '.-':
+        return None
+    month, year = period[:2], period[3:]
+    if not (month.isdigit() and year.isdigit()) or not 1 <= int(month) <= 12:
+        return None
+    return int(year) * 100 + int(month)
+
 def extract_month_from_date(date):
     if pd.isna(date):
         return None
@@ -32,4 +46,27 @@ def extract_month_from_date(date):
         
         raise ValueError(f"Не вдалося розпізнати формат дати: {date}")
     
-    raise ValueError(f"Непідтримуваний тип дати: {type(date)}")
\ No newline at end of file
+    raise ValueError(f"Непідтримуваний тип дати: {type(date)}")
+
+def extract_month_series(series):
+    # Векторний аналог extract_month для цілої колонки
+    parts = series.astype('string').str.extract(_MONTH_RE)
+    return parts[0] + '-' + parts[1]
+
+def extract_month_from_date_series(series):
+    # Векторний аналог extract_month_from_date: кожен формат з DATE_FORMATS
+    # застосовується до ще не розпізнаних значень колонки
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.dt.strftime('%m-%Y')
+
+    parsed = pd.Series(pd.NaT, index=series.index, dtype='datetime64[ns]')
+    pending = series.notna()
+    for date_format in DATE_FORMATS:
+        if not pending.any():
+            break
+        parsed.loc[pending] = pd.to_datetime(series[pending], format=date_format, errors='coerce')
+        pending &= parsed.isna()
+
+    if pending.any():
+        raise ValueError(f"Не вдалося розпізнати формат дати: {series[pending].iloc[0]}")
+    return parsed.dt.strftime('%m-%Y')
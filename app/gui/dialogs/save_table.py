@@ -1,6 +1,9 @@
 import tkinter as tk
 from tkinter import messagebox, ttk
 
+# Таблиці, доступні для збереження
+_TABLES = ("Акти", "Оплати (з бази)", "Оплати (з банку)", "Загальний звіт", "Підсумки по компанії та роках")
+
 class SaveTableDialog:
     def __init__(self, root, callback):
         self.root = root
@@ -13,15 +16,15 @@ class SaveTableDialog:
         self.create_widgets()
 
     def create_widgets(self):
-        tk.Label(self.dialog, text="Виберіть таблицю для збереження:").pack(pady=10)
+        # Розмір вікна фіксований, тому віджети розміщуємо за координатами без узгодження розмірів pack
+        tk.Label(self.dialog, text="Виберіть таблицю для збереження:").place(x=10, y=10, width=280, height=20)
 
         self.table_var = tk.StringVar()
-        tables = ["Акти", "Оплати (з бази)", "Оплати (з банку)", "Загальний звіт", "Підсумки по компанії та роках"]
-        table_menu = ttk.Combobox(self.dialog, textvariable=self.table_var, values=tables, width=25)
-        table_menu.pack(pady=5)
-        table_menu.current(0)
+        self.table_var.set(_TABLES[0])
+        table_menu = ttk.Combobox(self.dialog, textvariable=self.table_var, values=_TABLES)
+        table_menu.place(x=20, y=40, width=260, height=28)
 
-        tk.Button(self.dialog, text="Зберегти", command=self.save).pack(pady=10)
+        tk.Button(self.dialog, text="Зберегти", command=self.save).place(x=100, y=90, width=100, height=30)
 
     def save(self):
         selected_table = self.table_var.get()
@@ -52,10 +52,11 @@ class ActForm:
 
     def load_file(self):
         if self.source_var.get() == "1С":
-            file_path = filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx *.xls")])
-            if file_path:
+            # Можна вибрати кілька файлів одразу, вони обробляються паралельно
+            file_paths = filedialog.askopenfilenames(filetypes=[("Excel files", "*.xlsx *.xls")])
+            if file_paths:
                 try:
-                    self.data_processor.process_1c_acts(file_path, self.db_manager)
+                    self.data_processor.process_excel_files([(path, 'acts') for path in file_paths], self.db_manager)
                     messagebox.showinfo("Успіх", "Акти з 1С успішно збережено!")
                     self.update_callback()
                     self.act_window.destroy()
@@ -1,3 +1,5 @@
+import queue
+import threading
 import tkinter as tk
 from tkinter import messagebox, ttk
 from app.core.data.db import DatabaseManager
@@ -15,18 +17,14 @@ class ActAdjustmentForm:
         self.create_widgets()
 
     def create_widgets(self):
-        acts = self.db_manager.get_all_acts()
-        companies = sorted(set(act[0] for act in acts))
-        counterparties = sorted(set(act[1] for act in acts))
-
         tk.Label(self.adjust_window, text="Компанія:").pack(pady=5)
         self.company_var = tk.StringVar()
-        self.company_menu = ttk.Combobox(self.adjust_window, textvariable=self.company_var, values=companies, width=37)
+        self.company_menu = ttk.Combobox(self.adjust_window, textvariable=self.company_var, values=(), width=37)
         self.company_menu.pack()
 
         tk.Label(self.adjust_window, text="Контрагент:").pack(pady=5)
         self.counterparty_var = tk.StringVar()
-        self.counterparty_menu = ttk.Combobox(self.adjust_window, textvariable=self.counterparty_var, values=counterparties, width=37)
+        self.counterparty_menu = ttk.Combobox(self.adjust_window, textvariable=self.counterparty_var, values=(), width=37)
         self.counterparty_menu.pack()
 
         tk.Label(self.adjust_window, text="Період (наприклад, 11.2019):").pack(pady=5)
@@ -39,6 +37,35 @@ class ActAdjustmentForm:
 
         tk.Button(self.adjust_window, text="Зберегти", command=self.save_adjustment).pack(pady=20)
 
+        # Списки компаній і контрагентів читаються у фоновому потоці, щоб вікно не чекало на базу;
+        # Tk не потокобезпечний, тому результат забирає головний потік через after
+        self._lookups = queue.Queue(maxsize=1)
+        threading.Thread(target=self._load_lookups, daemon=True).start()
+        self.adjust_window.after(50, self._apply_lookups)
+
+    def _load_lookups(self):
+        try:
+            # Унікальні значення вже відсортовані за індексом
+            self._lookups.put((self.db_manager.get_unique_companies(), self.db_manager.get_unique_counterparties()))
+        except Exception as e:
+            self._lookups.put(e)
+
+    def _apply_lookups(self):
+        if not self.adjust_window.winfo_exists():
+            return
+        try:
+            result = self._lookups.get_nowait()
+        except queue.Empty:
+            self.adjust_window.after(50, self._apply_lookups)
+            return
+
+        if isinstance(result, Exception):
+            messagebox.showerror("Помилка", f"Не вдалося завантажити компанії та контрагентів: {result}")
+            return
+        companies, counterparties = result
+        self.company_menu.configure(values=companies)
+        self.counterparty_menu.configure(values=counterparties)
+
     def save_adjustment(self):
         try:
             company = self.company_var.get()
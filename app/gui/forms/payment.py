@@ -54,11 +54,12 @@ class PaymentForm:
     def load_file(self):
         source = self.source_var.get()
         if source in ["1С", "Укргазбанк", "Ощадбанк"]:
-            file_path = filedialog.askopenfilename(filetypes=[("Excel files", "*.xlsx *.xls")])
-            if file_path:
+            # Можна вибрати кілька файлів одразу, вони обробляються паралельно
+            file_paths = filedialog.askopenfilenames(filetypes=[("Excel files", "*.xlsx *.xls")])
+            if file_paths:
                 try:
                     if source == "1С":
-                        self.data_processor.process_1c_payments(file_path, self.db_manager)
+                        self.data_processor.process_excel_files([(path, 'payments') for path in file_paths], self.db_manager)
                         messagebox.showinfo("Успіх", "Оплати з 1С успішно збережено!")
                         self.update_callback()
                         self.payment_window.destroy()
@@ -67,6 +67,9 @@ class PaymentAnalyzerApp:
         self.logger.info("Database cleared successfully")
         messagebox.showinfo("Успіх", "База даних очищена!")
 
+    def close(self):
+        self.db_manager.close()
+
     def __del__(self):
         self.logger.info("Closing PaymentAnalyzerApp")
         self.logger_setup.close()
\ No newline at end of file
@@ -1,5 +1,12 @@
 from app.config.logging_config import setup_logging
 
+# 1,234.50 -> "1 234,50": роздільник тисяч пробіл, десятковий кома
+_NUMBER_FORMAT = str.maketrans(',.', ' ,')
+# Символи, які прибираються перед перевіркою, чи текст у таблиці є числом
+_NUMBER_CHECK = str.maketrans('', '', ' ,-.%')
+# "1 000,50" або "12,50%" -> "1000.50" / "12.50"
+_NUMBER_PARSE = str.maketrans({' ': None, ',': '.', '%': None})
+
 class TableFormatter:
     def __init__(self):
         self.logger_setup = setup_logging()
@@ -8,9 +15,18 @@ class TableFormatter:
 
     def format_number(self, number):
         if isinstance(number, (int, float)):
-            return f"{number:,.2f}".replace(',', ' ').replace('.', ',')
+            return f"{number:,.2f}".translate(_NUMBER_FORMAT)
         return number
 
+    def parse_number(self, value):
+        # Зворотне перетворення відформатованого значення з таблиці на число для збереження в Excel
+        if isinstance(value, str) and value.translate(_NUMBER_CHECK).isdigit():
+            try:
+                return float(value.translate(_NUMBER_PARSE))
+            except ValueError:
+                pass
+        return value
+
     def format_percentage(self, value):
         if isinstance(value, (int, float)):
             return f"{value:.2f}%"
@@ -75,13 +75,13 @@ class TableManager:
             table.update()
 
     def save(self, table_name):
-        self.logger.info(f"Saving table: {table_name}")
+        self.logger.info("Saving table: %s", table_name)
         # Перетворюємо назву таблиці з GUI на ключ у self.tables
         table_key = self.table_name_mapping.get(table_name, table_name)
         if table_key in self.tables:
             self.tables[table_key].save()
         else:
-            self.logger.error(f"Unknown table: {table_name} (mapped to {table_key})")
+            self.logger.error("Unknown table: %s (mapped to %s)", table_name, table_key)
             tk.messagebox.showerror("Помилка", "Невідома таблиця!")
 
     def __del__(self):
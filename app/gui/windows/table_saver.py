@@ -1,27 +1,21 @@
 import pandas as pd
 from tkinter import filedialog, messagebox
 from app.config.logging_config import setup_logging
+from app.gui.windows.table_formatter import TableFormatter
 
 class TableSaver:
     def __init__(self):
         self.logger = setup_logging()
         self.logger.info("Initializing TableSaver")
+        self.formatter = TableFormatter()
 
     def save(self, tree, table_name):
-        self.logger.info(f"Saving table: {table_name}")
+        self.logger.info("Saving table: %s", table_name)
         columns = [tree.heading(col)['text'] for col in tree['columns']]
         data = []
         for item in tree.get_children():
             values = tree.item(item)['values']
-            formatted_values = []
-            for value in values:
-                if isinstance(value, str) and value.replace(' ', '').replace(',', '').replace('-', '').replace('.', '').replace(' ', '').replace('%', '').isdigit():
-                    try:
-                        value = float(value.replace(' ', '').replace(',', '.').replace('%', ''))
-                    except ValueError:
-                        pass
-                formatted_values.append(value)
-            data.append(formatted_values)
+            data.append([self.formatter.parse_number(value) for value in values])
 
         df = pd.DataFrame(data, columns=columns)
 
@@ -47,11 +41,11 @@ class TableSaver:
                             worksheet.set_column(col_num, col_num, None, percentage_format)
                     
                     writer.close()
-                    self.logger.info(f"Table '{table_name}' saved successfully to {save_path}")
+                    self.logger.info("Table '%s' saved successfully to %s", table_name, save_path)
                 except ImportError:
                     df.to_excel(save_path, index=False, engine='openpyxl')
-                    self.logger.info(f"Table '{table_name}' saved successfully to {save_path} using openpyxl")
+                    self.logger.info("Table '%s' saved successfully to %s using openpyxl", table_name, save_path)
                 messagebox.showinfo("Успіх", f"Таблиця '{table_name}' збережена: {save_path}")
             except Exception as e:
-                self.logger.error(f"Error saving table '{table_name}': {str(e)}")
+                self.logger.error("Error saving table '%s': %s", table_name, e)
                 messagebox.showerror("Помилка", f"Не вдалося зберегти файл: {str(e)}")
\ No newline at end of file
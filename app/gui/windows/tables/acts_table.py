@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk
 from app.gui.windows.table_formatter import TableFormatter
+from app.gui.windows.tables.redraw import needs_redraw
 from app.config.logging_config import setup_logging
 
 class ActsTable:
@@ -14,9 +15,12 @@ class ActsTable:
         self.formatter = TableFormatter()
         self.frame = None
         self.tree = None
+        # Дані, показані в таблиці востаннє (див. needs_redraw)
+        self._shown = None
 
     def create(self):
         self.logger.info("Creating ActsTable")
+        self._shown = None
         self.frame = ttk.Frame(self.parent)
         self.frame.pack(fill="both", expand=True)
 
@@ -37,11 +41,12 @@ class ActsTable:
 
     def update(self):
         self.logger.info("Updating ActsTable")
+        acts = self.db_manager.get_all_acts()
+        self.logger.info("Loaded %d acts", len(acts))
+        if not needs_redraw(self, acts):
+            return
         for item in self.tree.get_children():
             self.tree.delete(item)
-
-        acts = self.db_manager.get_all_acts()
-        self.logger.info(f"Loaded {len(acts)} acts")
         for act in acts:
             company, counterparty, period, amount = act
             self.tree.insert("", "end", values=(company, counterparty, period, self.formatter.format_number(amount)))
@@ -55,15 +60,7 @@ class ActsTable:
         data = []
         for item in self.tree.get_children():
             values = self.tree.item(item)['values']
-            formatted_values = []
-            for value in values:
-                if isinstance(value, str) and value.replace(' ', '').replace(',', '').replace('-', '').replace('.', '').replace(' ', '').replace('%', '').isdigit():
-                    try:
-                        value = float(value.replace(' ', '').replace(',', '.').replace('%', ''))
-                    except ValueError:
-                        pass
-                formatted_values.append(value)
-            data.append(formatted_values)
+            data.append([self.formatter.parse_number(value) for value in values])
 
         df = pd.DataFrame(data, columns=columns)
 
@@ -89,13 +86,13 @@ class ActsTable:
                             worksheet.set_column(col_num, col_num, None, percentage_format)
                     
                     writer.close()
-                    self.logger.info(f"ActsTable saved successfully to {save_path}")
+                    self.logger.info("ActsTable saved successfully to %s", save_path)
                 except ImportError:
                     df.to_excel(save_path, index=False, engine='openpyxl')
-                    self.logger.info(f"ActsTable saved successfully to {save_path} using openpyxl")
+                    self.logger.info("ActsTable saved successfully to %s using openpyxl", save_path)
                 tk.messagebox.showinfo("Успіх", f"Таблиця 'Акти' збережена: {save_path}")
             except Exception as e:
-                self.logger.error(f"Error saving ActsTable: {str(e)}")
+                self.logger.error("Error saving ActsTable: %s", e)
                 tk.messagebox.showerror("Помилка", f"Не вдалося зберегти файл: {str(e)}")
 
     def __del__(self):
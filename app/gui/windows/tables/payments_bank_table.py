@@ -1,6 +1,8 @@
+import operator
 import tkinter as tk
 from tkinter import ttk
 from app.gui.windows.table_formatter import TableFormatter
+from app.gui.windows.tables.redraw import needs_redraw
 from app.config.logging_config import setup_logging
 
 class PaymentsBankTable:
@@ -14,10 +16,13 @@ class PaymentsBankTable:
         self.formatter = TableFormatter()
         self.frame = None
         self.tree = None
+        # Дані, показані в таблиці востаннє (див. needs_redraw)
+        self._shown = None
         self.monthly_summary = None
 
     def create(self):
         self.logger.info("Creating PaymentsBankTable")
+        self._shown = None
         self.frame = ttk.Frame(self.parent)
         self.frame.pack(fill="both", expand=True)
 
@@ -38,11 +43,14 @@ class PaymentsBankTable:
 
     def update(self):
         self.logger.info("Updating PaymentsBankTable")
+        # Зведення замінюється цілим об'єктом через set_monthly_summary, тож достатньо порівняти посилання
+        if not needs_redraw(self, self.monthly_summary, operator.is_):
+            return
         for item in self.tree.get_children():
             self.tree.delete(item)
 
         if self.monthly_summary is not None and not self.monthly_summary.empty:
-            self.logger.info(f"Loaded {len(self.monthly_summary)} bank payments")
+            self.logger.info("Loaded %d bank payments", len(self.monthly_summary))
             for (company, counterparty, month), row in self.monthly_summary.iterrows():
                 self.tree.insert("", "end", values=(
                     company, 
@@ -67,15 +75,7 @@ class PaymentsBankTable:
         data = []
         for item in self.tree.get_children():
             values = self.tree.item(item)['values']
-            formatted_values = []
-            for value in values:
-                if isinstance(value, str) and value.replace(' ', '').replace(',', '').replace('-', '').replace('.', '').replace(' ', '').replace('%', '').isdigit():
-                    try:
-                        value = float(value.replace(' ', '').replace(',', '.').replace('%', ''))
-                    except ValueError:
-                        pass
-                formatted_values.append(value)
-            data.append(formatted_values)
+            data.append([self.formatter.parse_number(value) for value in values])
 
         df = pd.DataFrame(data, columns=columns)
 
@@ -101,13 +101,13 @@ class PaymentsBankTable:
                             worksheet.set_column(col_num, col_num, None, percentage_format)
                     
                     writer.close()
-                    self.logger.info(f"PaymentsBankTable saved successfully to {save_path}")
+                    self.logger.info("PaymentsBankTable saved successfully to %s", save_path)
                 except ImportError:
                     df.to_excel(save_path, index=False, engine='openpyxl')
-                    self.logger.info(f"PaymentsBankTable saved successfully to {save_path} using openpyxl")
+                    self.logger.info("PaymentsBankTable saved successfully to %s using openpyxl", save_path)
                 tk.messagebox.showinfo("Успіх", f"Таблиця 'Оплати (з банку)' збережена: {save_path}")
             except Exception as e:
-                self.logger.error(f"Error saving PaymentsBankTable: {str(e)}")
+                self.logger.error("Error saving PaymentsBankTable: %s", e)
                 tk.messagebox.showerror("Помилка", f"Не вдалося зберегти файл: {str(e)}")
 
     def __del__(self):
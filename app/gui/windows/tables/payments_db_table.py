@@ -1,6 +1,8 @@
 import tkinter as tk
+from collections import defaultdict
 from tkinter import ttk
 from app.gui.windows.table_formatter import TableFormatter
+from app.gui.windows.tables.redraw import needs_redraw
 from app.config.logging_config import setup_logging
 
 class PaymentsDbTable:
@@ -14,9 +16,12 @@ class PaymentsDbTable:
         self.formatter = TableFormatter()
         self.frame = None
         self.tree = None
+        # Дані, показані в таблиці востаннє (див. needs_redraw)
+        self._shown = None
 
     def create(self):
         self.logger.info("Creating PaymentsDbTable")
+        self._shown = None
         self.frame = ttk.Frame(self.parent)
         self.frame.pack(fill="both", expand=True)
 
@@ -37,20 +42,17 @@ class PaymentsDbTable:
 
     def update(self):
         self.logger.info("Updating PaymentsDbTable")
+
+        # Агрегуємо оплати по мірі читання, не тримаючи весь список у пам'яті
+        payments_by_month = defaultdict(float)
+        for company, counterparty, period, amount in self.db_manager.iter_all_payments():
+            payments_by_month[(company, counterparty, period)] += amount
+        self.logger.info("Loaded %d payment groups", len(payments_by_month))
+        if not needs_redraw(self, payments_by_month):
+            return
         for item in self.tree.get_children():
             self.tree.delete(item)
 
-        payments = self.db_manager.get_all_payments()
-        self.logger.info(f"Loaded {len(payments)} payments")
-        payments_by_month = {}
-        for payment in payments:
-            company, counterparty, period, amount = payment
-            key = (company, counterparty, period)
-            if key in payments_by_month:
-                payments_by_month[key] += amount
-            else:
-                payments_by_month[key] = amount
-
         for (company, counterparty, period), total_amount in payments_by_month.items():
             self.tree.insert("", "end", values=(company, counterparty, period, self.formatter.format_number(total_amount)))
 
@@ -63,15 +65,7 @@ class PaymentsDbTable:
         data = []
         for item in self.tree.get_children():
             values = self.tree.item(item)['values']
-            formatted_values = []
-            for value in values:
-                if isinstance(value, str) and value.replace(' ', '').replace(',', '').replace('-', '').replace('.', '').replace(' ', '').replace('%', '').isdigit():
-                    try:
-                        value = float(value.replace(' ', '').replace(',', '.').replace('%', ''))
-                    except ValueError:
-                        pass
-                formatted_values.append(value)
-            data.append(formatted_values)
+            data.append([self.formatter.parse_number(value) for value in values])
 
         df = pd.DataFrame(data, columns=columns)
 
@@ -97,13 +91,13 @@ class PaymentsDbTable:
                             worksheet.set_column(col_num, col_num, None, percentage_format)
                     
                     writer.close()
-                    self.logger.info(f"PaymentsDbTable saved successfully to {save_path}")
+                    self.logger.info("PaymentsDbTable saved successfully to %s", save_path)
                 except ImportError:
                     df.to_excel(save_path, index=False, engine='openpyxl')
-                    self.logger.info(f"PaymentsDbTable saved successfully to {save_path} using openpyxl")
+                    self.logger.info("PaymentsDbTable saved successfully to %s using openpyxl", save_path)
                 tk.messagebox.showinfo("Успіх", f"Таблиця 'Оплати (з бази)' збережена: {save_path}")
             except Exception as e:
-                self.logger.error(f"Error saving PaymentsDbTable: {str(e)}")
+                self.logger.error("Error saving PaymentsDbTable: %s", e)
                 tk.messagebox.showerror("Помилка", f"Не вдалося зберегти файл: {str(e)}")
 
     def __del__(self):
@@ -0,0 +1,11 @@
+import operator
+
+
+def needs_redraw(table, data, same=operator.eq):
+    # Таблиця тримає в table._shown копію даних, показаних востаннє: якщо нові дані ті самі,
+    # Treeview не очищається й не заповнюється заново
+    if table._shown is not None and same(data, table._shown):
+        table.logger.info("%s data unchanged, skipping redraw", type(table).__name__)
+        return False
+    table._shown = data
+    return True
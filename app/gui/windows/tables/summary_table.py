@@ -1,6 +1,7 @@
 import tkinter as tk
 from tkinter import ttk
 from app.gui.windows.table_formatter import TableFormatter
+from app.gui.windows.tables.redraw import needs_redraw
 from app.config.logging_config import setup_logging
 
 class SummaryTable:
@@ -14,9 +15,12 @@ class SummaryTable:
         self.formatter = TableFormatter()
         self.frame = None
         self.tree = None
+        # Дані, показані в таблиці востаннє (див. needs_redraw)
+        self._shown = None
 
     def create(self):
         self.logger.info("Creating SummaryTable")
+        self._shown = None
         self.frame = ttk.Frame(self.parent)
         self.frame.pack(fill="both", expand=True)
 
@@ -38,44 +42,17 @@ class SummaryTable:
 
     def update(self):
         self.logger.info("Updating SummaryTable")
+        summary = self.db_manager.get_summary_by_period()
+        self.logger.info("Loaded %d summary rows", len(summary))
+        if not needs_redraw(self, summary):
+            return
         for item in self.tree.get_children():
             self.tree.delete(item)
 
-        acts = self.db_manager.get_all_acts()
-        payments = self.db_manager.get_all_payments()
-        self.logger.info(f"Loaded {len(acts)} acts and {len(payments)} payments")
-        self.logger.info(f"Acts: {acts}")
-        self.logger.info(f"Payments: {payments}")
-
-        summary_data = {}
-        for act in acts:
-            company, counterparty, period, amount = act
-            key = (period, company, counterparty)
-            if key not in summary_data:
-                summary_data[key] = {'act_amount': 0, 'payment_amount': 0}
-            summary_data[key]['act_amount'] += amount
-            self.logger.info(f"Added act to summary_data: {key}, amount: {amount}")
-
-        for payment in payments:
-            company, counterparty, period, amount = payment
-            key = (period, company, counterparty)
-            if key not in summary_data:
-                summary_data[key] = {'act_amount': 0, 'payment_amount': 0}
-            summary_data[key]['payment_amount'] += amount
-            self.logger.info(f"Added payment to summary_data: {key}, amount: {amount}")
-
-        self.logger.info(f"Summary data: {summary_data}")
-
-        sorted_keys = sorted(summary_data.keys(), key=lambda x: (x[0].split('-')[1], x[0].split('-')[0]))
-
-        for key in sorted_keys:
-            period, company, counterparty = key
-            act_amount = summary_data[key]['act_amount']
-            payment_amount = summary_data[key]['payment_amount']
+        for period, company, counterparty, act_amount, payment_amount in summary:
             debt = act_amount - payment_amount
             payment_percentage = (payment_amount / act_amount * 100) if act_amount != 0 else 0
             debt_percentage = (debt / act_amount * 100) if act_amount != 0 else 0
-            self.logger.info(f"Inserting row: {period}, {company}, {counterparty}, act: {act_amount}, payment: {payment_amount}, debt: {debt}")
             self.tree.insert("", "end", values=(
                 period,
                 company,
@@ -96,15 +73,7 @@ class SummaryTable:
         data = []
         for item in self.tree.get_children():
             values = self.tree.item(item)['values']
-            formatted_values = []
-            for value in values:
-                if isinstance(value, str) and value.replace(' ', '').replace(',', '').replace('-', '').replace('.', '').replace(' ', '').replace('%', '').isdigit():
-                    try:
-                        value = float(value.replace(' ', '').replace(',', '.').replace('%', ''))
-                    except ValueError:
-                        pass
-                formatted_values.append(value)
-            data.append(formatted_values)
+            data.append([self.formatter.parse_number(value) for value in values])
 
         df = pd.DataFrame(data, columns=columns)
 
@@ -130,13 +99,13 @@ class SummaryTable:
                             worksheet.set_column(col_num, col_num, None, percentage_format)
                     
                     writer.close()
-                    self.logger.info(f"SummaryTable saved successfully to {save_path}")
+                    self.logger.info("SummaryTable saved successfully to %s", save_path)
                 except ImportError:
                     df.to_excel(save_path, index=False, engine='openpyxl')
-                    self.logger.info(f"SummaryTable saved successfully to {save_path} using openpyxl")
+                    self.logger.info("SummaryTable saved successfully to %s using openpyxl", save_path)
                 tk.messagebox.showinfo("Успіх", f"Таблиця 'Загальний звіт' збережена: {save_path}")
             except Exception as e:
-                self.logger.error(f"Error saving SummaryTable: {str(e)}")
+                self.logger.error("Error saving SummaryTable: %s", e)
                 tk.messagebox.showerror("Помилка", f"Не вдалося зберегти файл: {str(e)}")
 
     def __del__(self):
@@ -10,4 +10,7 @@ from app.gui.windows.main import PaymentAnalyzerApp
 if __name__ == "__main__":
     root = tk.Tk()
     app = PaymentAnalyzerApp(root)
-    root.mainloop()
\ No newline at end of file
+    try:
+        root.mainloop()
+    finally:
+        app.close()
\ No newline at end of file
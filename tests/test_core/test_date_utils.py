@@ -0,0 +1,38 @@
+import unittest
+import pandas as pd
+from app.core.utils.date_utils import (
+    extract_month, extract_month_from_date, extract_month_series, extract_month_from_date_series, period_to_int
+)
+
+class TestDateUtils(unittest.TestCase):
+    def test_period_to_int(self):
+        self.assertEqual(period_to_int("11-2019"), 201911)
+        self.assertEqual(period_to_int("01.2023"), 202301)
+
+    def test_period_to_int_invalid(self):
+        self.assertIsNone(period_to_int(None))
+        self.assertIsNone(period_to_int("13-2019"))
+        self.assertIsNone(period_to_int("11/2019"))
+        self.assertIsNone(period_to_int("2019-11"))
+
+    def test_extract_month_from_date_series(self):
+        dates = pd.Series(['01.02.2023', pd.Timestamp('2023-03-05'), None, '2023-04-05 10:00:00', '05.06.2023 11:12:13'])
+
+        # Результат збігається з поелементною функцією
+        result = extract_month_from_date_series(dates)
+        self.assertEqual(result[[0, 1, 3, 4]].tolist(), [extract_month_from_date(d) for d in dates[[0, 1, 3, 4]]])
+        self.assertTrue(pd.isna(result[2]))
+
+    def test_extract_month_from_date_series_invalid(self):
+        with self.assertRaises(ValueError):
+            extract_month_from_date_series(pd.Series(['01.02.2023', 'не дата']))
+
+    def test_extract_month_series(self):
+        texts = pd.Series(['Оплата за 11.2019', 'оплата 12-2019 ТОВ', 'без періоду', None])
+
+        result = extract_month_series(texts)
+        self.assertEqual(result[:2].tolist(), [extract_month(t) for t in texts[:2]])
+        self.assertTrue(result[2:].isna().all())
+
+if __name__ == '__main__':
+    unittest.main()
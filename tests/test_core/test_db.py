@@ -0,0 +1,212 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+from app.core.data import db as db_module
+from app.core.data.db import DatabaseManager
+
+class TestDatabaseManager(unittest.TestCase):
+    def setUp(self):
+        # Тимчасовий каталог замість DATA_DIR
+        self.data_dir = tempfile.mkdtemp()
+        self.data_dir_patch = patch('app.core.data.db.DATA_DIR', self.data_dir)
+        self.data_dir_patch.start()
+        self.db = DatabaseManager()
+
+    def tearDown(self):
+        self.db.close()
+        self.data_dir_patch.stop()
+        shutil.rmtree(self.data_dir, ignore_errors=True)
+
+    def _query(self, db_path, sql):
+        with self.db._get_connection(db_path) as conn:
+            return conn.execute(sql).fetchall()
+
+    def test_save_act_stores_period_int(self):
+        self.db.save_act("ТОВ \"ПОРТ-СОЛАР\"", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ ДП", "11-2019", 1000.0)
+
+        self.assertEqual(self._query(self.db.acts_db, "SELECT company, counterparty, period, period_int FROM acts"), [("ПОРТ-СОЛАР", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "11-2019", 201911)])
+
+    def test_save_payments_batch(self):
+        rows = [
+            ("САН ПАУЕР ПЕРВОМАЙСЬК ТОВ", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ ДП", "01-2023", 600.0),
+            ("ТОВ \"ТЕРСЛАВ\"", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ ДП", "02-2023", 200.0),
+        ]
+
+        # Метод приймає ітератор і повертає кількість вставлених рядків
+        self.assertEqual(self.db.save_payments_batch(iter(rows)), 2)
+        self.assertEqual(
+            self._query(self.db.payments_db, "SELECT company, period_int, amount FROM payments ORDER BY id"),
+            [("ПЕРВОМАЙСЬК", 202301, 600.0), ("ТЕРСЛАВ", 202302, 200.0)],
+        )
+
+    def test_save_acts_batch_in_chunks(self):
+        rows = [("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "01-2023", float(i)) for i in range(5)]
+
+        # Менший розмір частини, щоб перевірити кілька executemany в одній транзакції
+        with patch('app.core.data.db.DB_BATCH_SIZE', 2):
+            self.assertEqual(self.db.save_acts_batch(rows), 5)
+        self.assertEqual(len(self.db.get_all_acts()), 5)
+
+    def test_iter_all_acts_streams_all_rows(self):
+        # Рядків більше, ніж забирається з курсора за один fetchmany
+        self.db.save_acts_batch(("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "01-2023", float(i)) for i in range(2500))
+
+        self.assertEqual(sum(amount for *_, amount in self.db.iter_all_acts()), sum(range(2500)))
+        # Після вичерпання генератора з'єднання повертається в пул
+        self.assertTrue(self.db._pools[self.db.acts_db].full())
+
+    def test_closing_partial_iteration_returns_connection(self):
+        self.db.save_acts_batch(("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "01-2023", float(i)) for i in range(10))
+
+        rows = self.db.iter_all_acts()
+        next(rows)
+        self.assertFalse(self.db._pools[self.db.acts_db].full())
+        # Закритий до кінця генератор теж повертає з'єднання в пул
+        rows.close()
+        self.assertTrue(self.db._pools[self.db.acts_db].full())
+
+    def test_exhausted_pool_raises_instead_of_hanging(self):
+        self.db.save_act("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "01-2023", 1000.0)
+        self.db.save_act("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "02-2023", 500.0)
+        # Усі з'єднання зайняті незавершеними генераторами
+        held = [self.db.iter_all_acts() for _ in range(db_module.DB_POOL_SIZE)]
+        for rows in held:
+            next(rows)
+
+        with patch('app.core.data.db.DB_POOL_TIMEOUT', 0.01):
+            with self.assertRaises(sqlite3.OperationalError):
+                self.db.get_summary_by_period()
+        for rows in held:
+            rows.close()
+
+    def test_read_after_close_raises(self):
+        self.db.close()
+
+        with self.assertRaises(sqlite3.ProgrammingError):
+            self.db.get_all_acts()
+
+    def test_clear_database_clears_both_tables(self):
+        self.db.save_act("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "01-2023", 1000.0)
+        self.db.save_payment("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "01-2023", 600.0)
+
+        self.db.clear_database()
+
+        self.assertEqual(self.db.get_all_acts(), [])
+        self.assertEqual(self.db.get_all_payments(), [])
+
+    def test_get_unique_companies_and_counterparties(self):
+        self.db.save_act("ТЕРСЛАВ", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "01-2023", 1000.0)
+        self.db.save_act("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "01-2023", 500.0)
+        self.db.save_act("ПЕРВОМАЙСЬК", "ІНШИЙ", "02-2023", 200.0)
+
+        # Значення без повторів і в тому ж порядку, що дає sorted()
+        self.assertEqual(self.db.get_unique_companies(), ["ПЕРВОМАЙСЬК", "ТЕРСЛАВ"])
+        self.assertEqual(self.db.get_unique_counterparties(), sorted(["ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "ІНШИЙ"]))
+
+    def test_unique_lookups_are_cached_until_next_write(self):
+        self.db.save_act("ТЕРСЛАВ", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "01-2023", 1000.0)
+        self.assertEqual(self.db.get_unique_companies(), ["ТЕРСЛАВ"])
+
+        # Повторний виклик без запису не звертається до бази
+        with patch.object(self.db, '_get_connection') as connection_mock:
+            self.assertEqual(self.db.get_unique_companies(), ["ТЕРСЛАВ"])
+        connection_mock.assert_not_called()
+
+        # Після запису список оновлюється
+        self.db.save_act("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "01-2023", 500.0)
+        self.assertEqual(self.db.get_unique_companies(), ["ПЕРВОМАЙСЬК", "ТЕРСЛАВ"])
+
+    def test_adjust_acts_matches_period_by_value(self):
+        self.db.save_act("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "11-2019", 1000.0)
+
+        # Період у форматі з крапкою відповідає тому самому місяцю
+        self.db.adjust_acts("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "11.2019", -250.0)
+
+        self.assertEqual(self.db.get_all_acts(), [("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "11-2019", 750.0)])
+
+    def test_adjust_acts_inserts_when_missing(self):
+        self.db.adjust_acts("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "12-2019", 300.0)
+
+        self.assertEqual(self.db.get_all_acts(), [("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "12-2019", 300.0)])
+
+    def test_adjust_acts_rejects_invalid_period(self):
+        with self.assertRaises(ValueError):
+            self.db.adjust_acts("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "листопад", 300.0)
+
+    def test_get_summary_by_period(self):
+        self.db.save_act("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "01-2023", 1000.0)
+        self.db.save_act("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "01-2023", 500.0)
+        self.db.save_payment("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "01-2023", 600.0)
+        # Оплата без акту також потрапляє у звіт, а грудень 2022 іде першим
+        self.db.save_payment("ТЕРСЛАВ", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "02-2023", 200.0)
+        self.db.save_act("ТЕРСЛАВ", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "12-2022", 100.0)
+
+        self.assertEqual(self.db.get_summary_by_period(), [
+            ("12-2022", "ТЕРСЛАВ", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", 100.0, 0),
+            ("01-2023", "ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", 1500.0, 600.0),
+            ("02-2023", "ТЕРСЛАВ", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", 0, 200.0),
+        ])
+
+    def test_get_summary_by_company(self):
+        self.db.save_act("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "01-2023", 1000.0)
+        self.db.save_act("ПЕРВОМАЙСЬК", "ІНШИЙ", "02-2023", 500.0)
+        self.db.save_payment("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "12-2022", 600.0)
+
+        # Рядки впорядковані за роком, потім за компанією
+        self.assertEqual(self.db.get_summary_by_company(), [
+            ("ПЕРВОМАЙСЬК", "2022", 0, 600.0),
+            ("ПЕРВОМАЙСЬК", "2023", 1500.0, 0),
+        ])
+
+    def test_summary_with_many_groups_uses_index_lookups(self):
+        # Тисячі груп: акти для К0..К2999, платежі для К1500..К4499
+        self.db.save_acts_batch((f"К{i}", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "01-2023", 1.0) for i in range(3000))
+        self.db.save_payments_batch((f"К{i}", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "01-2023", 2.0) for i in range(1500, 4500))
+
+        by_period = self.db.get_summary_by_period()
+        self.assertEqual(len(by_period), 4500)
+        self.assertEqual(sum(row[3] for row in by_period), 3000.0)
+        self.assertEqual(sum(row[4] for row in by_period), 6000.0)
+        self.assertEqual(len(self.db.get_summary_by_company()), 4500)
+
+        # Пара з іншого боку шукається за індексом, а не вкладеним циклом по всьому CTE
+        for sql in (db_module._SUMMARY_BY_PERIOD_SQL, db_module._SUMMARY_BY_COMPANY_SQL):
+            plan = [row[3] for row in self._query(self.db.acts_db, "EXPLAIN QUERY PLAN " + sql)]
+            self.assertTrue(any(step.startswith("SEARCH p USING") for step in plan), plan)
+            self.assertTrue(any(step.startswith("SEARCH a USING") for step in plan), plan)
+            self.assertFalse(any("RIGHT-JOIN" in step for step in plan), plan)
+
+    def test_context_manager_closes_connections(self):
+        with DatabaseManager() as db:
+            db.save_act("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "01-2023", 1000.0)
+        writer, _ = db._writers[db.acts_db]
+
+        # Після виходу з блоку з'єднання закриті
+        self.assertTrue(db._pools[db.acts_db].empty())
+        with self.assertRaises(sqlite3.ProgrammingError):
+            writer.execute("SELECT 1")
+
+    def test_migrates_period_int_for_existing_database(self):
+        self.db.close()
+        # Стара схема без колонки period_int
+        for name, table in (("acts.db", "acts"), ("payments.db", "payments")):
+            os.remove(os.path.join(self.data_dir, name))
+            conn = sqlite3.connect(os.path.join(self.data_dir, name))
+            conn.execute(f"CREATE TABLE {table} (id INTEGER PRIMARY KEY AUTOINCREMENT, company TEXT, counterparty TEXT, period TEXT, amount REAL, created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP)")
+            conn.executemany(f"INSERT INTO {table} (company, counterparty, period, amount) VALUES ('A', 'B', ?, 1.0)",
+                             [('03-2021',), ('13-2019',), ('ab-cdef',), ('04.2022',)])
+            conn.commit()
+            conn.close()
+
+        self.db = DatabaseManager()
+
+        # Некоректні періоди (місяць 13, не цифри) лишаються без period_int, як і в period_to_int
+        expected = [(202103,), (None,), (None,), (202204,)]
+        self.assertEqual(self._query(self.db.acts_db, "SELECT period_int FROM acts ORDER BY id"), expected)
+        self.assertEqual(self._query(self.db.payments_db, "SELECT period_int FROM payments ORDER BY id"), expected)
+
+if __name__ == '__main__':
+    unittest.main()
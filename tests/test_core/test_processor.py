@@ -0,0 +1,203 @@
+import importlib.util
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+import pandas as pd
+from app.core.data import processor as processor_module
+from app.core.data.processor import DataProcessor
+
+class TestDataProcessor(unittest.TestCase):
+    def setUp(self):
+        self.processor = DataProcessor()
+        # Мок для db_manager
+        self.db_manager = MagicMock()
+
+    def _write_excel(self, name, df):
+        # Тимчасовий Excel-файл з даними
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir, ignore_errors=True)
+        file_path = os.path.join(tmp_dir, name)
+        df.to_excel(file_path, index=False)
+        return file_path
+
+    def _saved_rows(self, method):
+        # Рядки, передані в пакетне збереження
+        captured = []
+        method.side_effect = lambda rows: captured.extend(rows) or len(captured)
+        return captured
+
+    def test_process_1c_acts(self):
+        df = pd.DataFrame({
+            'Дата': ['01.02.2023', '2023-03-05'],
+            'Сумма': ['10.5', 20],
+            'Контрагент': ['Гарантований покупець ДП', 'Інший'],
+            'Организация': ['ТОВ "ТЕРСЛАВ"', 'Сан Пауер Первомайськ ТОВ'],
+        })
+        saved = self._saved_rows(self.db_manager.save_acts_batch)
+
+        self.processor.process_1c_acts(self._write_excel('acts.xlsx', df), self.db_manager)
+
+        self.assertEqual(saved, [
+            ('ТЕРСЛАВ', 'ГАРАНТОВАНИЙ ПОКУПЕЦЬ', '02-2023', 10.5),
+            ('ПЕРВОМАЙСЬК', 'ІНШИЙ', '03-2023', 20.0),
+        ])
+
+    def test_process_1c_payments(self):
+        df = pd.DataFrame({
+            'Комментарий': ['Оплата за 11.2019', 'оплата 12-2019'],
+            'Сумма документа': [100.0, 200.0],
+            'Контрагент': ['Гарантований покупець ДП', 'Гарантований покупець ДП'],
+            'Организация': ['ТОВ "ПОРТ-СОЛАР"', 'ТОВ "ПОРТ-СОЛАР"'],
+        })
+        saved = self._saved_rows(self.db_manager.save_payments_batch)
+
+        self.processor.process_1c_payments(self._write_excel('payments.xlsx', df), self.db_manager)
+
+        self.assertEqual(saved, [
+            ('ПОРТ-СОЛАР', 'ГАРАНТОВАНИЙ ПОКУПЕЦЬ', '11-2019', 100.0),
+            ('ПОРТ-СОЛАР', 'ГАРАНТОВАНИЙ ПОКУПЕЦЬ', '12-2019', 200.0),
+        ])
+
+    @unittest.skipUnless(importlib.util.find_spec('python_calamine'), "python-calamine не встановлено")
+    def test_process_1c_acts_same_result_with_each_engine(self):
+        df = pd.DataFrame({
+            'Дата': ['01.02.2023', pd.Timestamp('2023-04-07')],
+            'Сумма': ['10.5', 20],
+            'Контрагент': ['Гарантований покупець ДП', 'Інший'],
+            'Организация': ['ТОВ "ТЕРСЛАВ"', 'Сан Пауер Первомайськ ТОВ'],
+        })
+        file_path = self._write_excel('acts.xlsx', df)
+
+        # openpyxl і calamine повертають комірки по-різному, а результат імпорту має збігатися
+        for engine in ('openpyxl', 'calamine'):
+            with self.subTest(engine=engine), patch.dict(processor_module._EXCEL_ENGINES, {'.xlsx': engine}):
+                db_manager = MagicMock()
+                saved = self._saved_rows(db_manager.save_acts_batch)
+                self.processor.process_1c_acts(file_path, db_manager)
+                self.assertEqual(saved, [
+                    ('ТЕРСЛАВ', 'ГАРАНТОВАНИЙ ПОКУПЕЦЬ', '02-2023', 10.5),
+                    ('ПЕРВОМАЙСЬК', 'ІНШИЙ', '04-2023', 20.0),
+                ])
+
+    def test_process_1c_acts_reads_only_required_columns(self):
+        file_path = self._write_excel('acts.xlsx', pd.DataFrame({
+            'Дата': ['01.02.2023'],
+            'Коментар': ['зайва колонка'],
+            'Сумма': [10.5],
+            'Контрагент': ['Гарантований покупець ДП'],
+            'Организация': ['ТОВ "ТЕРСЛАВ"'],
+        }))
+        saved = self._saved_rows(self.db_manager.save_acts_batch)
+
+        with patch.object(pd.ExcelFile, '__init__', autospec=True, side_effect=pd.ExcelFile.__init__) as open_mock, \
+             patch.object(pd.ExcelFile, 'parse', autospec=True, side_effect=pd.ExcelFile.parse) as parse_mock:
+            self.processor.process_1c_acts(file_path, self.db_manager)
+
+        # Книга відкривається один раз: спершу читається лише заголовок, потім тільки потрібні колонки
+        self.assertEqual(open_mock.call_count, 1)
+        self.assertEqual(parse_mock.call_args_list[0].kwargs, {'nrows': 0})
+        self.assertNotIn('Коментар', parse_mock.call_args.kwargs['usecols'])
+        self.assertEqual(saved, [('ТЕРСЛАВ', 'ГАРАНТОВАНИЙ ПОКУПЕЦЬ', '02-2023', 10.5)])
+
+    def test_process_excel_files_in_parallel(self):
+        tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp_dir, ignore_errors=True)
+        acts_path = os.path.join(tmp_dir, 'acts.xlsx')
+        payments_path = os.path.join(tmp_dir, 'payments.xlsx')
+        pd.DataFrame({
+            'Дата': ['01.02.2023'], 'Сумма': [10.5], 'Контрагент': ['Гарантований покупець ДП'], 'Организация': ['ТОВ "ТЕРСЛАВ"'],
+        }).to_excel(acts_path, index=False)
+        pd.DataFrame({
+            'Комментарий': ['оплата за 02.2023'], 'Сумма документа': [5.0], 'Контрагент': ['Гарантований покупець ДП'], 'Организация': ['ТОВ "ТЕРСЛАВ"'],
+        }).to_excel(payments_path, index=False)
+        saved_acts = self._saved_rows(self.db_manager.save_acts_batch)
+        saved_payments = self._saved_rows(self.db_manager.save_payments_batch)
+
+        # Файли розбираються в окремих процесах, а зберігаються в поточному
+        count = self.processor.process_excel_files([(acts_path, 'acts'), (payments_path, 'payments')], self.db_manager)
+
+        self.assertEqual(count, 2)
+        self.assertEqual(saved_acts, [('ТЕРСЛАВ', 'ГАРАНТОВАНИЙ ПОКУПЕЦЬ', '02-2023', 10.5)])
+        self.assertEqual(saved_payments, [('ТЕРСЛАВ', 'ГАРАНТОВАНИЙ ПОКУПЕЦЬ', '02-2023', 5.0)])
+
+    def test_process_1c_acts_rejects_invalid_rows(self):
+        df = pd.DataFrame({
+            'Дата': ['01.02.2023', 'не дата'],
+            'Сумма': [10.0, 20.0],
+            'Контрагент': ['А', 'Б'],
+            'Организация': ['В', 'Г'],
+        })
+
+        # Жоден рядок не зберігається, якщо хоч один некоректний
+        with self.assertRaises(ValueError):
+            self.processor.process_1c_acts(self._write_excel('acts.xlsx', df), self.db_manager)
+        self.db_manager.save_acts_batch.assert_not_called()
+
+    def test_process_1c_payments_rejects_blank_names(self):
+        df = pd.DataFrame({
+            'Комментарий': ['оплата за 01.2023', 'оплата за 02.2023'],
+            'Сумма документа': [100.0, 200.0],
+            'Контрагент': ['Гарантований покупець ДП', None],
+            'Организация': ['ТОВ "ТЕРСЛАВ"', 'ТОВ "ТЕРСЛАВ"'],
+        })
+
+        # Порожня назва контрагента - некоректний рядок, імпорт не виконується
+        with self.assertRaises(ValueError):
+            self.processor.process_1c_payments(self._write_excel('payments.xlsx', df), self.db_manager)
+        self.db_manager.save_payments_batch.assert_not_called()
+
+    def test_process_1c_acts_missing_columns(self):
+        df = pd.DataFrame({'Дата': ['01.02.2023']})
+
+        with self.assertRaises(ValueError):
+            self.processor.process_1c_acts(self._write_excel('acts.xlsx', df), self.db_manager)
+
+    def test_process_bank_payments(self):
+        df = pd.DataFrame({
+            'NAME': ['ТОВ "ТЕРСЛАВ"', 'ТОВ "ТЕРСЛАВ"', 'ТОВ "ТЕРСЛАВ"'],
+            'NAME_KOR': ['Гарантований покупець ДП', 'Гарантований покупець ДП', 'Гарантований покупець ДП'],
+            'PURPOSE': ['оплата за 01.2023', 'оплата за 01.2023', 'без періоду'],
+            'SUM_PD_NOM': [100.0, 50.0, 10.0],
+        })
+
+        summary = self.processor.process_bank_payments(df)
+
+        # Рядок без періоду відкидається, решта групується за місяцем
+        row = summary.loc[('ТЕРСЛАВ', 'ГАРАНТОВАНИЙ ПОКУПЕЦЬ', '01-2023')]
+        self.assertEqual(len(summary), 1)
+        self.assertEqual(row['SUM_PD_NOM'], 150.0)
+        self.assertEqual(row['кількість платежів'], 2)
+
+    def test_process_bank_payments_orders_months_chronologically(self):
+        df = pd.DataFrame({
+            'NAME': ['ТЕРСЛАВ', 'ТЕРСЛАВ', 'ТЕРСЛАВ'],
+            'NAME_KOR': ['ГАРАНТОВАНИЙ ПОКУПЕЦЬ', 'ГАРАНТОВАНИЙ ПОКУПЕЦЬ', 'ГАРАНТОВАНИЙ ПОКУПЕЦЬ'],
+            'PURPOSE': ['оплата за 01.2023', 'оплата за 12.2022', 'оплата за 03.2022'],
+            'SUM_PD_NOM': [1.0, 2.0, 3.0],
+        })
+
+        summary = self.processor.process_bank_payments(df)
+
+        # Місяці впорядковані за часом, а не як рядки "mm-yyyy"
+        self.assertEqual(summary.index.get_level_values('місяць').tolist(), ['03-2022', '12-2022', '01-2023'])
+
+    def test_process_bank_payments_parses_text_amounts(self):
+        df = pd.DataFrame({
+            'NAME': ['ТЕРСЛАВ', 'ТЕРСЛАВ'],
+            'NAME_KOR': ['ГАРАНТОВАНИЙ ПОКУПЕЦЬ', 'ГАРАНТОВАНИЙ ПОКУПЕЦЬ'],
+            'PURPOSE': ['оплата за 02.2023', 'оплата за 02.2023'],
+            'SUM_PD_NOM': ['1 000,50', '1\xa0000,25'],
+        })
+
+        summary = self.processor.process_bank_payments(df)
+
+        self.assertEqual(summary.loc[('ТЕРСЛАВ', 'ГАРАНТОВАНИЙ ПОКУПЕЦЬ', '02-2023'), 'SUM_PD_NOM'], 2000.75)
+
+    def test_load_excel_rejects_unsupported_extension(self):
+        with self.assertRaises(ValueError):
+            self.processor.load_excel('payments.csv')
+
+if __name__ == '__main__':
+    unittest.main()
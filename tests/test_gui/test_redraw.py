@@ -0,0 +1,24 @@
+import operator
+import unittest
+from unittest.mock import Mock
+from app.gui.windows.tables.redraw import needs_redraw
+
+class TestNeedsRedraw(unittest.TestCase):
+    def setUp(self):
+        self.table = Mock(_shown=None)
+
+    def test_skips_unchanged_data(self):
+        self.assertTrue(needs_redraw(self.table, [("ТЕРСЛАВ", 1000.0)]))
+        # Рівні дані з нового запиту таблицю не перемальовують
+        self.assertFalse(needs_redraw(self.table, [("ТЕРСЛАВ", 1000.0)]))
+        self.assertTrue(needs_redraw(self.table, [("ТЕРСЛАВ", 2000.0)]))
+
+    def test_identity_comparison(self):
+        data = [("ТЕРСЛАВ", 1000.0)]
+        self.assertTrue(needs_redraw(self.table, data, operator.is_))
+        self.assertFalse(needs_redraw(self.table, data, operator.is_))
+        # Новий об'єкт з тим самим вмістом перемальовується
+        self.assertTrue(needs_redraw(self.table, list(data), operator.is_))
+
+if __name__ == '__main__':
+    unittest.main()
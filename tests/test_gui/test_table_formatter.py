@@ -0,0 +1,27 @@
+import unittest
+from app.gui.windows.table_formatter import TableFormatter
+
+class TestTableFormatter(unittest.TestCase):
+    def setUp(self):
+        self.formatter = TableFormatter()
+
+    def test_format_number(self):
+        self.assertEqual(self.formatter.format_number(1234567.891), "1 234 567,89")
+        self.assertEqual(self.formatter.format_number("ТЕРСЛАВ"), "ТЕРСЛАВ")
+
+    def test_parse_number_accepts_formatted_numbers(self):
+        # Пробіли між тисячами, кома як десятковий роздільник, від'ємні значення та відсотки
+        self.assertEqual(self.formatter.parse_number("1 000,50"), 1000.5)
+        self.assertEqual(self.formatter.parse_number("-1 234,25"), -1234.25)
+        self.assertEqual(self.formatter.parse_number("12,50%"), 12.5)
+        self.assertEqual(self.formatter.parse_number(self.formatter.format_number(-98765.4)), -98765.4)
+
+    def test_parse_number_keeps_text(self):
+        # Назви, періоди та порожні значення лишаються як є
+        self.assertEqual(self.formatter.parse_number("ГАРАНТОВАНИЙ ПОКУПЕЦЬ"), "ГАРАНТОВАНИЙ ПОКУПЕЦЬ")
+        self.assertEqual(self.formatter.parse_number("01-2023"), "01-2023")
+        self.assertEqual(self.formatter.parse_number(""), "")
+        self.assertEqual(self.formatter.parse_number(5), 5)
+
+if __name__ == '__main__':
+    unittest.main()
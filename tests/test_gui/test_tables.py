@@ -108,7 +108,7 @@ class TestTables(unittest.TestCase):
 
     def test_payments_db_table_update(self):
         # Налаштування моків
-        self.db_manager.get_all_payments.return_value = [
+        self.db_manager.iter_all_payments.return_value = [
             ("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "01-2023", 1000.0),
             ("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "01-2023", 500.0)  # Такий самий ключ, сума додається
         ]
@@ -226,11 +226,8 @@ class TestTables(unittest.TestCase):
 
     def test_summary_table_update(self):
         # Налаштування моків
-        self.db_manager.get_all_acts.return_value = [
-            ("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "01-2023", 1000.0)
-        ]
-        self.db_manager.get_all_payments.return_value = [
-            ("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "01-2023", 600.0)
+        self.db_manager.get_summary_by_period.return_value = [
+            ("01-2023", "ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", 1000.0, 600.0)
         ]
         table = SummaryTable(self.parent, self.db_manager)
         table.tree = self.tree_mock
@@ -286,11 +283,8 @@ class TestTables(unittest.TestCase):
 
     def test_summary_by_company_table_update(self):
         # Налаштування моків
-        self.db_manager.get_all_acts.return_value = [
-            ("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "01-2023", 1000.0)
-        ]
-        self.db_manager.get_all_payments.return_value = [
-            ("ПЕРВОМАЙСЬК", "ГАРАНТОВАНИЙ ПОКУПЕЦЬ", "01-2023", 600.0)
+        self.db_manager.get_summary_by_company.return_value = [
+            ("ПЕРВОМАЙСЬК", "2023", 1000.0, 600.0)
         ]
         table = SummaryByCompanyTable(self.parent, self.db_manager)
         table.tree = self.tree_mock